@@ -1,5 +1,7 @@
+from collections import deque
 from furl import furl
 import logging
+import threading
 
 import libtaxii
 
@@ -25,6 +27,9 @@ class AbstractClient(object):
 
     SUPPORTED_SCHEMES = ['http', 'https']
 
+    # Amount of message IDs generated at once
+    MESSAGE_ID_BATCH_SIZE = 64
+
     taxii_version = None
 
     def __init__(self, host=None, discovery_path=None, port=None,
@@ -52,6 +57,17 @@ class AbstractClient(object):
         self.headers = headers or {}
         self.timeout = timeout
 
+        # Maximum number of keep-alive connections per host
+        self.pool_maxsize = dispatcher.HTTP_POOL_MAXSIZE
+
+        # Session is shared by threads running requests concurrently
+        # (asyncio client executor, poll prefetch)
+        self._session = None
+        self._session_params = None
+        self._session_lock = threading.RLock()
+
+        self._message_ids = deque()
+
         self.log = logging.getLogger(
             "{}.{}".format(self.__module__, self.__class__.__name__))
 
@@ -140,18 +156,16 @@ class AbstractClient(object):
             self._prepare_url(self.jwt_url),
             self.username,
             self.password)
-        session.auth = dispatcher.JWTAuth(self.jwt_token)
+        with self._session_lock:
+            session.auth = dispatcher.JWTAuth(self.jwt_token)
+            if session is self._session:
+                self._session_params = self._generic_session_params()
         return self.jwt_token
 
-    def prepare_generic_session(self):
-        '''
-        Prepare basic generic session with configured
-        proxies, headers, username/password (if no JWT url configured),
-        cert file, key file and SSL verification flags.
-        '''
-        return dispatcher.get_generic_session(
-            proxies=self.proxies,
-            headers=self.headers,
+    def _generic_session_params(self):
+        return dict(
+            proxies=dict(self.proxies) if self.proxies else None,
+            headers=dict(self.headers),
             username=self.username if not self.jwt_url else None,
             password=self.password if not self.jwt_url else None,
             cert_file=self.cert_file,
@@ -160,14 +174,59 @@ class AbstractClient(object):
             ca_cert=self.ca_cert,
             verify_ssl=self.verify_ssl,
             jwt_token=self.jwt_token,
+            pool_maxsize=self.pool_maxsize,
         )
 
-    def _execute_request(self, request, uri=None, service_type=None):
+    def prepare_generic_session(self):
+        '''
+        Prepare basic generic session with configured
+        proxies, headers, username/password (if no JWT url configured),
+        cert file, key file and SSL verification flags.
+        '''
+        return dispatcher.get_generic_session(
+            **self._generic_session_params())
+
+    def _get_session(self):
+        # Session (and its pool of keep-alive connections) is shared
+        # by all requests and recreated only if client configuration
+        # has changed since it was created.
+        with self._session_lock:
+            params = self._generic_session_params()
+
+            if self._session is None or params != self._session_params:
+                self.close()
+                self._session = dispatcher.get_generic_session(**params)
+                self._session_params = params
+
+            return self._session
+
+    def close(self):
+        '''
+        Close HTTP session and its pooled connections.
+
+        Client can still be used after it was closed,
+        a new session will be created for the next request.
+        '''
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+                self._session_params = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _execute_request(self, request, uri=None, service_type=None,
+                         request_body=None):
         '''
         Execute generic TAXII request.
 
         A service is defined by ``uri`` parameter or is chosen from pre-cached
-        services by ``service_type``.
+        services by ``service_type``. If ``request_body`` is provided, it is
+        sent instead of the serialized ``request``.
         '''
         if not uri and not service_type:
             raise NoURIProvidedError('URI or service_type needed')
@@ -181,7 +240,7 @@ class AbstractClient(object):
             raise ValueError(
                 'Key file is encrypted but key password was not provided')
 
-        session = self.prepare_generic_session()
+        session = self._get_session()
 
         uses_jwt = self.jwt_url and self.username and self.password
         if uses_jwt and not self.jwt_token:
@@ -194,6 +253,7 @@ class AbstractClient(object):
                 request,
                 taxii_binding=self.taxii_binding,
                 timeout=self.timeout,
+                request_body=request_body,
             )
 
         try:
@@ -208,7 +268,12 @@ class AbstractClient(object):
                 raise
 
     def _generate_id(self):
-        return libtaxii.common.generate_message_id(version=self.services_version)
+        while True:
+            try:
+                return self._message_ids.popleft()
+            except IndexError:
+                self._message_ids.extend(utils.generate_message_ids(
+                    self.services_version, self.MESSAGE_ID_BATCH_SIZE))
 
     def _get_service(self, service_type):
         candidates = self.get_services(service_type=service_type)
@@ -230,7 +295,9 @@ class AbstractClient(object):
         Get services advertised by TAXII server.
 
         This method will try to do automatic discovery by calling
-        :py:meth:`discover_services`.
+        :py:meth:`discover_services`, if services were not discovered
+        and cached before. Use :py:meth:`invalidate_services` to force
+        a new discovery.
 
         :param str service_type: filter services by specific type. Accepted
                                  values are listed in
@@ -256,7 +323,7 @@ class AbstractClient(object):
         :raises `cabby.exceptions.NoURIProvidedError`:
                 no URI provided and client can't discover services
         '''
-        if self.services:
+        if self.services is not None:
             services = self.services
         else:
             try:
@@ -272,6 +339,15 @@ class AbstractClient(object):
         else:
             return services
 
+    def invalidate_services(self):
+        '''
+        Drop services cached by :py:meth:`discover_services`.
+
+        Next call that needs service autodiscovery will send
+        a new discovery request.
+        '''
+        self.services = None
+
     def discover_services(self, uri=None, cache=True):
         '''
         Discover services advertised by TAXII server.
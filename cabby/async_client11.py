@@ -0,0 +1,263 @@
+'''
+Asyncio interface for TAXII 1.1 client.
+
+Requires Python 3.6+.
+'''
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from .client11 import Client11
+
+
+_EXHAUSTED = object()
+
+
+class AsyncClient11(object):
+    '''Asyncio client implementation for TAXII Specification v1.1
+
+    Wraps a :py:class:`cabby.client11.Client11` instance and exposes its
+    public methods as coroutines. Blocking HTTP requests are executed
+    in ``executor`` (the event loop's default executor if not provided),
+    so multiple requests can be driven concurrently from a single event loop.
+
+    Client configuration (authentication, proxies, headers, timeout)
+    is taken from the wrapped client::
+
+        client = create_client(
+            'test.taxiistand.com',
+            use_https=True,
+            discovery_path='/read-write/services/discovery')
+        client.set_auth(username='john', password='p4ssw0rd')
+
+        async_client = AsyncClient11(client)
+
+    Poll multiple collections concurrently::
+
+        async def fetch(collection_name):
+            return [block async for block in async_client.poll(
+                collection_name)]
+
+        async def fetch_all(names):
+            return await asyncio.gather(*[fetch(name) for name in names])
+
+    Amount of requests running at the same time is limited by the number
+    of executor's workers. To run a lot of concurrent polls, set
+    ``max_workers``: the client will use its own thread pool of that size
+    and will keep as many keep-alive connections per host::
+
+        async_client = AsyncClient11(client, max_workers=100)
+
+        async def fetch_pages(collection_name):
+            return [page async for page in async_client.poll_pages(
+                collection_name)]
+
+        try:
+            results = await asyncio.gather(*[
+                fetch_pages(name) for name in names])
+        finally:
+            await async_client.close()
+
+    Alternative event loops (e.g. uvloop) do not make requests faster,
+    as network I/O is done by the blocking HTTP client in the executor.
+
+    :param `cabby.client11.Client11` client: client instance
+    :param `concurrent.futures.Executor` executor: executor
+           used to run blocking requests
+    :param int max_workers: if set, a thread pool executor of this size
+           is created and owned by the client (``executor`` is ignored)
+    '''
+
+    def __init__(self, client, executor=None, max_workers=None):
+        if not isinstance(client, Client11):
+            raise ValueError(
+                'TAXII 1.1 client instance expected, got {}'
+                .format(type(client).__name__))
+
+        self.client = client
+        self.executor = executor
+
+        self._own_executor = bool(max_workers)
+
+        if max_workers:
+            self.executor = ThreadPoolExecutor(max_workers=max_workers)
+            client.pool_maxsize = max(client.pool_maxsize, max_workers)
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs))
+
+    async def _iterate(self, gen):
+        try:
+            while True:
+                obj = await self._run(next, gen, _EXHAUSTED)
+                if obj is _EXHAUSTED:
+                    break
+                yield obj
+        finally:
+            try:
+                gen.close()
+            except ValueError:
+                # Generator is still running in the executor
+                # (awaiting coroutine was cancelled)
+                pass
+
+    async def discover_services(self, uri=None, cache=True):
+        '''Coroutine version of
+        :py:meth:`cabby.abstract.AbstractClient.discover_services`.
+        '''
+        return await self._run(
+            self.client.discover_services, uri=uri, cache=cache)
+
+    async def get_services(self, service_type=None, service_types=None):
+        '''Coroutine version of
+        :py:meth:`cabby.abstract.AbstractClient.get_services`.
+        '''
+        return await self._run(
+            self.client.get_services,
+            service_type=service_type, service_types=service_types)
+
+    async def get_collections(self, uri=None):
+        '''Coroutine version of
+        :py:meth:`cabby.client11.Client11.get_collections`.
+        '''
+        return await self._run(self.client.get_collections, uri=uri)
+
+    async def get_subscription_status(self, collection_name,
+                                      subscription_id=None, uri=None):
+        '''Coroutine version of
+        :py:meth:`cabby.client11.Client11.get_subscription_status`.
+        '''
+        return await self._run(
+            self.client.get_subscription_status, collection_name,
+            subscription_id=subscription_id, uri=uri)
+
+    async def pause_subscription(self, collection_name, subscription_id,
+                                 uri=None):
+        '''Coroutine version of
+        :py:meth:`cabby.client11.Client11.pause_subscription`.
+        '''
+        return await self._run(
+            self.client.pause_subscription, collection_name,
+            subscription_id, uri=uri)
+
+    async def resume_subscription(self, collection_name, subscription_id,
+                                  uri=None):
+        '''Coroutine version of
+        :py:meth:`cabby.client11.Client11.resume_subscription`.
+        '''
+        return await self._run(
+            self.client.resume_subscription, collection_name,
+            subscription_id, uri=uri)
+
+    async def unsubscribe(self, collection_name, subscription_id, uri=None):
+        '''Coroutine version of
+        :py:meth:`cabby.client11.Client11.unsubscribe`.
+        '''
+        return await self._run(
+            self.client.unsubscribe, collection_name, subscription_id,
+            uri=uri)
+
+    async def subscribe(self, collection_name, count_only=False,
+                        inbox_service=None, content_bindings=None, uri=None):
+        '''Coroutine version of
+        :py:meth:`cabby.client11.Client11.subscribe`.
+        '''
+        return await self._run(
+            self.client.subscribe, collection_name, count_only=count_only,
+            inbox_service=inbox_service, content_bindings=content_bindings,
+            uri=uri)
+
+    async def push(self, content, content_binding, collection_names=None,
+                   timestamp=None, uri=None):
+        '''Coroutine version of
+        :py:meth:`cabby.client11.Client11.push`.
+        '''
+        return await self._run(
+            self.client.push, content, content_binding,
+            collection_names=collection_names, timestamp=timestamp, uri=uri)
+
+    async def push_bytes(self, content, content_binding,
+                         collection_names=None, timestamp=None, uri=None):
+        '''Coroutine version of
+        :py:meth:`cabby.client11.Client11.push_bytes`.
+        '''
+        return await self._run(
+            self.client.push_bytes, content, content_binding,
+            collection_names=collection_names, timestamp=timestamp, uri=uri)
+
+    async def get_content_count(self, collection_name, begin_date=None,
+                                end_date=None, subscription_id=None,
+                                inbox_service=None, content_bindings=None,
+                                uri=None):
+        '''Coroutine version of
+        :py:meth:`cabby.client11.Client11.get_content_count`.
+        '''
+        return await self._run(
+            self.client.get_content_count, collection_name,
+            begin_date=begin_date, end_date=end_date,
+            subscription_id=subscription_id, inbox_service=inbox_service,
+            content_bindings=content_bindings, uri=uri)
+
+    async def poll(self, collection_name, begin_date=None, end_date=None,
+                   subscription_id=None, inbox_service=None,
+                   content_bindings=None, uri=None, prefetch=0):
+        '''Asynchronous generator version of
+        :py:meth:`cabby.client11.Client11.poll`.
+
+        Content blocks are yielded as they are received, fulfilment parts
+        are requested transparently::
+
+            async for block in async_client.poll('collection-A'):
+                print(block.content)
+        '''
+        gen = self.client.poll(
+            collection_name, begin_date=begin_date, end_date=end_date,
+            subscription_id=subscription_id, inbox_service=inbox_service,
+            content_bindings=content_bindings, uri=uri, prefetch=prefetch)
+
+        async for block in self._iterate(gen):
+            yield block
+
+    async def poll_pages(self, collection_name, begin_date=None,
+                         end_date=None, subscription_id=None,
+                         inbox_service=None, content_bindings=None, uri=None,
+                         prefetch=0):
+        '''Asynchronous generator version of
+        :py:meth:`cabby.client11.Client11.poll_pages`.
+
+        Switching to the executor once per page is cheaper than once
+        per content block, which makes it preferable for large results.
+        '''
+        gen = self.client.poll_pages(
+            collection_name, begin_date=begin_date, end_date=end_date,
+            subscription_id=subscription_id, inbox_service=inbox_service,
+            content_bindings=content_bindings, uri=uri, prefetch=prefetch)
+
+        async for page in self._iterate(gen):
+            yield page
+
+    async def fulfilment(self, collection_name, result_id, part_number=1,
+                         uri=None):
+        '''Asynchronous generator version of
+        :py:meth:`cabby.client11.Client11.fulfilment`.
+        '''
+        gen = self.client.fulfilment(
+            collection_name, result_id, part_number=part_number, uri=uri)
+
+        async for block in self._iterate(gen):
+            yield block
+
+    async def close(self):
+        '''
+        Close HTTP session of the wrapped client and shut down
+        the executor, if it was created by this client.
+        '''
+        if self._own_executor:
+            self.executor.shutdown(wait=False)
+        self.client.close()
+
+    def __repr__(self):
+        return '{name}(client={client!r})'.format(
+            name=type(self).__name__, client=self.client)
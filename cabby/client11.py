@@ -1,7 +1,12 @@
 
+import time
+import uuid
+
+import six
 import libtaxii.messages_11 as tm11
 
 from . import constants as const
+from . import dispatcher
 from .abstract import AbstractClient
 from .entities import ContentBlockCount
 from .converters import (
@@ -9,10 +14,18 @@ from .converters import (
     to_collection_entities
 )
 from .utils import (
-    pack_content_bindings, get_utc_now, pack_content_binding
+    pack_content_bindings, get_utc_now, pack_content_binding,
+    iterate_in_background
 )
 
 
+# Marks the end of a result part in a stream of content blocks
+_PART_END = object()
+
+# Python 2.7 does not have a monotonic clock
+_monotonic = getattr(time, 'monotonic', time.time)
+
+
 class Client11(AbstractClient):
     '''Client implementation for TAXII Specification v1.1
 
@@ -22,6 +35,31 @@ class Client11(AbstractClient):
     taxii_binding = const.XML_11_BINDING
     services_version = const.TAXII_SERVICES_11
 
+    def __init__(self, *args, **kwargs):
+        super(Client11, self).__init__(*args, **kwargs)
+
+        self._status_cache = {}
+        self._status_cache_ttl = 0
+
+    def enable_status_cache(self, ttl):
+        '''Cache subscription status responses.
+
+        Responses returned by :py:meth:`get_subscription_status` are
+        reused for ``ttl`` seconds for the same collection, subscription
+        ID and URI. Cached responses for a collection are dropped when
+        the client changes any of its subscriptions.
+
+        :param float ttl: cache time-to-live in seconds,
+                          set to 0 to disable the cache
+        '''
+        self._status_cache_ttl = ttl
+        self._status_cache.clear()
+
+    def _drop_cached_status(self, collection_name):
+        for key in list(self._status_cache):
+            if key[0] == collection_name:
+                self._status_cache.pop(key, None)
+
     def _discovery_request(self, uri):
         request = tm11.DiscoveryRequest(message_id=self._generate_id())
         response = self._execute_request(request, uri=uri)
@@ -30,14 +68,16 @@ class Client11(AbstractClient):
     def __subscription_status_request(self, action, collection_name,
                                       subscription_id=None, uri=None):
 
-        request_params = dict(
+        request = tm11.ManageCollectionSubscriptionRequest(
             message_id=self._generate_id(),
             action=action,
             collection_name=collection_name,
             subscription_id=subscription_id
         )
 
-        request = tm11.ManageCollectionSubscriptionRequest(**request_params)
+        if action != const.ACT_STATUS:
+            self._drop_cached_status(collection_name)
+
         response = self._execute_request(
             request, uri=uri,
             service_type=const.SVC_COLLECTION_MANAGEMENT)
@@ -56,6 +96,8 @@ class Client11(AbstractClient):
         if ``uri`` is not provided, client will try to discover services and
         find Collection Management Service among them.
 
+        Responses can be cached, see :py:meth:`enable_status_cache`.
+
         :param str collection_name: target collection name
         :param str subscription_id: subscription ID (optional)
         :param str uri: URI path to a specific Collection Management service
@@ -77,9 +119,29 @@ class Client11(AbstractClient):
                 no URI provided and client can't discover services
         '''
 
-        return self.__subscription_status_request(
-            const.ACT_STATUS, collection_name, subscription_id=subscription_id,
-            uri=uri)
+        if not self._status_cache_ttl:
+            return self.__subscription_status_request(
+                const.ACT_STATUS, collection_name,
+                subscription_id=subscription_id, uri=uri)
+
+        key = (collection_name, subscription_id, uri)
+        cached = self._status_cache.get(key)
+
+        if cached:
+            if cached[0] > _monotonic():
+                return cached[1]
+            # Expired entries are dropped, so the cache
+            # does not keep statuses that are not requested anymore
+            self._status_cache.pop(key, None)
+
+        response = self.__subscription_status_request(
+            const.ACT_STATUS, collection_name,
+            subscription_id=subscription_id, uri=uri)
+
+        self._status_cache[key] = (
+            _monotonic() + self._status_cache_ttl, response)
+
+        return response
 
     def pause_subscription(self, collection_name, subscription_id, uri=None):
         '''Pause a subscription.
@@ -244,6 +306,9 @@ class Client11(AbstractClient):
             )
 
         request = tm11.ManageCollectionSubscriptionRequest(**rparams)
+
+        self._drop_cached_status(collection_name)
+
         response = self._execute_request(
             request, uri=uri,
             service_type=const.SVC_COLLECTION_MANAGEMENT)
@@ -316,6 +381,77 @@ class Client11(AbstractClient):
                 no URI provided and client can't discover services
         '''
 
+        inbox_message = self._prepare_inbox_message(
+            content, content_binding, collection_names, timestamp)
+
+        self._execute_request(inbox_message, uri=uri,
+                              service_type=const.SVC_INBOX)
+
+        self.log.debug("Content block successfully pushed")
+
+    def push_bytes(self, content, content_binding, collection_names=None,
+                   timestamp=None, uri=None):
+        '''Push large content into Inbox Service.
+
+        Same as :py:meth:`push`, but the content is not processed
+        by libtaxii: it is sent as is, in a CDATA section, in chunks
+        sliced from the original buffer. Recommended for content
+        larger than a few megabytes.
+
+        On Python 2.7 the request body is joined into a single string,
+        so the content is copied once.
+
+        :param content: UTF-8 encoded content to push
+        :type content: bytes, bytearray or memoryview
+        :param content_binding: content binding for a content
+        :type content_binding: string or
+                               :py:class:`cabby.entities.ContentBinding`
+        :param list collection_names:
+                destination collection names
+        :param datetime timestamp: timestamp label of the content block
+                (current UTC time by default)
+        :param str uri: URI path to a specific Inbox Service
+
+        :raises ValueError:
+                if URI provided is invalid or schema is not supported
+        :raises `cabby.exceptions.HTTPError`:
+                if HTTP error happened
+        :raises `cabby.exceptions.UnsuccessfulStatusError`:
+                if Status Message received and status_type is not `SUCCESS`
+        :raises `cabby.exceptions.ServiceNotFoundError`:
+                if no service found
+        :raises `cabby.exceptions.AmbiguousServicesError`:
+                more than one service with type specified
+        :raises `cabby.exceptions.NoURIProvidedError`:
+                no URI provided and client can't discover services
+        '''
+
+        if isinstance(content, six.text_type):
+            content = content.encode('utf-8')
+
+        # Content is inlined into serialized message
+        # in place of a unique placeholder
+        placeholder = uuid.uuid4().hex
+
+        inbox_message = self._prepare_inbox_message(
+            placeholder, content_binding, collection_names, timestamp)
+
+        request_body = dispatcher.InlinedContentBody(
+            inbox_message.to_xml(), placeholder, content)
+
+        if six.PY2:
+            # Python 2.7 HTTP clients can only send string bodies
+            request_body = request_body.to_bytes()
+
+        self._execute_request(inbox_message, uri=uri,
+                              service_type=const.SVC_INBOX,
+                              request_body=request_body)
+
+        self.log.debug("Content block successfully pushed")
+
+    def _prepare_inbox_message(self, content, content_binding,
+                               collection_names=None, timestamp=None):
+
         content_block = tm11.ContentBlock(
             content=content,
             content_binding=pack_content_binding(content_binding, version=11),
@@ -328,48 +464,45 @@ class Client11(AbstractClient):
         if collection_names:
             inbox_message.destination_collection_names.extend(collection_names)
 
-        self._execute_request(inbox_message, uri=uri,
-                              service_type=const.SVC_INBOX)
-
-        self.log.debug("Content block successfully pushed")
+        return inbox_message
 
     def _prepare_poll_request(self, collection_name, begin_date=None,
                               end_date=None, subscription_id=None,
                               inbox_service=None, content_bindings=None,
                               count_only=False):
-        data = dict(
-            message_id=self._generate_id(),
-            collection_name=collection_name,
-            exclusive_begin_timestamp_label=begin_date,
-            inclusive_end_timestamp_label=end_date
-        )
-
         if subscription_id:
-            data['subscription_id'] = subscription_id
+            return tm11.PollRequest(
+                message_id=self._generate_id(),
+                collection_name=collection_name,
+                exclusive_begin_timestamp_label=begin_date,
+                inclusive_end_timestamp_label=end_date,
+                subscription_id=subscription_id)
+
+        if inbox_service:
+            message_bindings = inbox_service.message_bindings[0] \
+                if inbox_service.message_bindings else []
+
+            delivery_parameters = tm11.DeliveryParameters(
+                inbox_protocol=inbox_service.protocol,
+                inbox_address=inbox_service.address,
+                delivery_message_binding=message_bindings
+            )
         else:
-            _bindings = pack_content_bindings(content_bindings, version=11)
-            poll_params = {'content_bindings': _bindings}
-
-            if inbox_service:
-                message_bindings = inbox_service.message_bindings[0] \
-                    if inbox_service.message_bindings else []
-
-                poll_params['delivery_parameters'] = tm11.DeliveryParameters(
-                    inbox_protocol=inbox_service.protocol,
-                    inbox_address=inbox_service.address,
-                    delivery_message_binding=message_bindings
-                )
-                poll_params['allow_asynch'] = True
-
-            if count_only:
-                poll_params['response_type'] = const.RT_COUNT_ONLY
-            else:
-                poll_params['response_type'] = const.RT_FULL
+            delivery_parameters = None
 
-            data['poll_parameters'] = \
-                tm11.PollRequest.PollParameters(**poll_params)
+        poll_parameters = tm11.PollRequest.PollParameters(
+            response_type=const.RT_COUNT_ONLY if count_only else const.RT_FULL,
+            content_bindings=pack_content_bindings(
+                content_bindings, version=11),
+            allow_asynch=bool(inbox_service),
+            delivery_parameters=delivery_parameters)
 
-        return tm11.PollRequest(**data)
+        return tm11.PollRequest(
+            message_id=self._generate_id(),
+            collection_name=collection_name,
+            exclusive_begin_timestamp_label=begin_date,
+            inclusive_end_timestamp_label=end_date,
+            poll_parameters=poll_parameters)
 
     def get_content_count(self, collection_name, begin_date=None,
                           end_date=None, subscription_id=None,
@@ -435,7 +568,7 @@ class Client11(AbstractClient):
 
     def poll(self, collection_name, begin_date=None, end_date=None,
              subscription_id=None, inbox_service=None,
-             content_bindings=None, uri=None):
+             content_bindings=None, uri=None, prefetch=0):
         '''Poll content from Polling Service.
 
         if ``uri`` is not provided, client will try to discover services and
@@ -456,6 +589,10 @@ class Client11(AbstractClient):
         :param list content_bindings: list of stings or
                :py:class:`cabby.entities.ContentBinding` objects
         :param str uri: URI path to a specific Inbox Service
+        :param int prefetch: if set, content blocks are received in
+               a background thread, up to ``prefetch`` blocks ahead
+               of the consumer, and next result parts are requested
+               while current blocks are being processed
 
         :raises ValueError:
                 if URI provided is invalid or schema is not supported
@@ -471,6 +608,89 @@ class Client11(AbstractClient):
                 no URI provided and client can't discover services
         '''
 
+        # Request is prepared and sent on the first iteration
+        blocks = self._poll_blocks(
+            collection_name, begin_date=begin_date, end_date=end_date,
+            subscription_id=subscription_id, inbox_service=inbox_service,
+            content_bindings=content_bindings, uri=uri)
+
+        if prefetch:
+            blocks = iterate_in_background(blocks, buffer_size=prefetch)
+
+        return blocks
+
+    def poll_pages(self, collection_name, begin_date=None, end_date=None,
+                   subscription_id=None, inbox_service=None,
+                   content_bindings=None, uri=None, prefetch=0):
+        '''Poll content from Polling Service, page by page.
+
+        Same as :py:meth:`poll`, but content blocks are yielded as lists,
+        one list per result part returned by the server. Useful for
+        consumers that process content in bulk.
+
+        :param str collection_name: collection to poll
+        :param datetime begin_date: ask only for content blocks created
+               after `begin_date` (exclusive)
+        :param datetime end_date: ask only for content blocks created
+               before `end_date` (inclusive)
+        :param str subscription_id: ID of the existing subscription
+        :param `cabby.entities.InboxService` inbox_service:
+               Inbox Service that will accept content pushed by TAXII Server
+               in the context of this Poll Request
+        :param list content_bindings: list of strings or
+               :py:class:`cabby.entities.ContentBinding` objects
+        :param str uri: URI path to a specific Polling Service
+        :param int prefetch: if set, pages are received, parsed and
+               converted in a background thread, up to ``prefetch``
+               pages ahead of the consumer
+
+        :return: generator of lists of
+                 :py:class:`cabby.entities.ContentBlock` objects
+
+        :raises ValueError:
+                if URI provided is invalid or schema is not supported
+        :raises `cabby.exceptions.HTTPError`:
+                if HTTP error happened
+        :raises `cabby.exceptions.UnsuccessfulStatusError`:
+                if Status Message received and status_type is not `SUCCESS`
+        :raises `cabby.exceptions.ServiceNotFoundError`:
+                if no service found
+        :raises `cabby.exceptions.AmbiguousServicesError`:
+                more than one service with type specified
+        :raises `cabby.exceptions.NoURIProvidedError`:
+                no URI provided and client can't discover services
+        '''
+
+        # Request is prepared and sent on the first iteration
+        pages = self._poll_pages(
+            collection_name, begin_date=begin_date, end_date=end_date,
+            subscription_id=subscription_id, inbox_service=inbox_service,
+            content_bindings=content_bindings, uri=uri)
+
+        if prefetch:
+            # Whole pages are passed between threads, so the consumer
+            # gets ready lists of entities with one queue hop per page
+            pages = iterate_in_background(pages, buffer_size=prefetch)
+
+        return pages
+
+    def _poll_pages(self, collection_name, **kwargs):
+        blocks = self._poll_blocks(
+            collection_name, part_end=_PART_END, **kwargs)
+
+        page = []
+        for block in blocks:
+            if block is not _PART_END:
+                page.append(block)
+            elif page:
+                yield page
+                page = []
+
+    def _poll_blocks(self, collection_name, begin_date=None, end_date=None,
+                     subscription_id=None, inbox_service=None,
+                     content_bindings=None, uri=None, part_end=None):
+        # Yields content blocks of all result parts,
+        # followed by `part_end` marker for each part, if provided
         request = self._prepare_poll_request(
             collection_name,
             begin_date=begin_date,
@@ -491,6 +711,9 @@ class Client11(AbstractClient):
                 response = obj
                 break
 
+        if part_end is not None:
+            yield part_end
+
         if response and response.more:
             part = response.result_part_number
 
@@ -498,17 +721,35 @@ class Client11(AbstractClient):
                 part += 1
                 has_data = False
 
-                fulfilment_stream = self.fulfilment(
+                # Fulfilment stream is consumed directly instead of
+                # re-yielding blocks from `fulfilment` generator
+                fulfilment_stream = self._fulfilment_stream(
                     collection_name, response.result_id,
                     part_number=part, uri=uri)
 
-                for block in fulfilment_stream:
-                    has_data = True
-                    yield block
+                for obj in fulfilment_stream:
+                    if isinstance(obj, tm11.ContentBlock):
+                        has_data = True
+                        yield to_content_block_entity(obj)
+
+                if part_end is not None:
+                    yield part_end
 
                 if not has_data:
                     break
 
+    def _fulfilment_stream(self, collection_name, result_id, part_number,
+                           uri=None):
+        request = tm11.PollFulfillmentRequest(
+            message_id=self._generate_id(),
+            collection_name=collection_name,
+            result_id=result_id,
+            result_part_number=part_number
+        )
+
+        return self._execute_request(request, uri=uri,
+                                     service_type=const.SVC_POLL)
+
     def fulfilment(self, collection_name, result_id, part_number=1, uri=None):
         '''Poll content from Polling Service as a part of fulfilment process.
 
@@ -534,15 +775,8 @@ class Client11(AbstractClient):
                 no URI provided and client can't discover services
         '''
 
-        request = tm11.PollFulfillmentRequest(
-            message_id=self._generate_id(),
-            collection_name=collection_name,
-            result_id=result_id,
-            result_part_number=part_number
-        )
-
-        stream = self._execute_request(request, uri=uri,
-                                       service_type=const.SVC_POLL)
+        stream = self._fulfilment_stream(
+            collection_name, result_id, part_number=part_number, uri=uri)
 
         for obj in stream:
             if isinstance(obj, tm11.ContentBlock):
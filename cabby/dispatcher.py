@@ -1,10 +1,12 @@
 from collections import namedtuple
 import json
 import os
+import re
 import ssl
 import sys
 import logging
 
+import six
 from six import StringIO
 
 import furl
@@ -12,12 +14,16 @@ import gzip
 import requests
 from lxml import etree
 from six.moves import urllib
+from requests.adapters import HTTPAdapter
 from requests.auth import AuthBase, HTTPBasicAuth
+from requests.structures import CaseInsensitiveDict
 
 from libtaxii import messages_11 as tm11
 from libtaxii import messages_10 as tm10
+from libtaxii.constants import ns_map
 
 from . import constants as const
+from .utils import parse_datetime
 from ._version import __version__ as cabby_version
 
 from .exceptions import (
@@ -26,6 +32,11 @@ from .exceptions import (
 
 log = logging.getLogger(__name__)
 
+# Number of per-host connection pools kept by a session
+HTTP_POOL_CONNECTIONS = 4
+# Maximum number of keep-alive connections kept per host
+HTTP_POOL_MAXSIZE = 32
+
 
 def raise_http_error(status_code, response_stream=None):
     if log.isEnabledFor(logging.DEBUG) and response_stream:
@@ -35,23 +46,38 @@ def raise_http_error(status_code, response_stream=None):
 
 
 def send_taxii_request(
-        session, url, request, taxii_binding=None, timeout=None):
+        session, url, request, taxii_binding=None, timeout=None,
+        request_body=None):
     '''
     Send XML message to a TAXII service and parse a response.
+
+    If ``request_body`` is provided, it is sent instead
+    of the serialized ``request``.
     '''
 
     log.info("Sending {} to {}".format(request.message_type, url))
 
-    request_body = request.to_xml(pretty_print=True)
+    if request_body is None:
+        # Serialized without indentation: it is cheaper and
+        # leaves whitespace in the content blocks intact
+        request_body = request.to_xml()
 
-    log.debug("Request:\n%s", request_body.decode('utf-8'))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Request:\n%s",
+                      request.to_xml(pretty_print=True).decode('utf-8'))
+    else:
+        # Pre-built body (e.g. with inlined content) differs
+        # from the serialized request, so the latter is not logged
+        log.debug("Request body is provided by the caller, not logged")
 
-    session = get_taxii_session(
-        session,
+    # Session is shared between requests (and threads),
+    # so request specific headers are not set on it
+    headers = get_taxii_headers(
         url_scheme=furl.furl(url).scheme,
         message_binding=taxii_binding)
 
-    stream, headers = request_stream(session, url, request_body, timeout)
+    stream, headers = request_stream(
+        session, url, request_body, timeout, headers)
 
     gen = _parse_response(stream, headers, version=request.version)
     obj = next(gen)
@@ -66,6 +92,76 @@ def send_taxii_request(
     return obj
 
 
+class InlinedContentBody(object):
+    '''
+    Request body of a serialized TAXII message with a content inlined
+    as a CDATA section in place of a ``placeholder`` text.
+
+    Content is sent in chunks of ``chunk_size`` bytes, sliced from
+    the original buffer without copying it. The body can be iterated over
+    again if the request needs to be repeated.
+
+    The body has a known length, so requests sends it with
+    ``Content-Length`` header. When key password is used, the request
+    is sent by urllib, which sends iterable bodies with chunked encoding.
+
+    Python 2.7 HTTP clients can't send iterable bodies, use
+    :py:meth:`to_bytes` there to send the body as a single string.
+    '''
+
+    CDATA_START = b'<![CDATA['
+    CDATA_END = b']]>'
+    # CDATA section can't contain its own terminator,
+    # so the section is closed and reopened in the middle of it
+    CDATA_SPLIT = b']]><![CDATA['
+
+    def __init__(self, message, placeholder, content, chunk_size=65536):
+        parts = message.split(placeholder.encode('utf-8'))
+        if len(parts) != 2:
+            raise ValueError('Placeholder must occur in message exactly once')
+
+        self.prefix, self.suffix = parts
+        self.content = memoryview(content)
+        self.chunk_size = chunk_size
+
+        if six.PY2 and isinstance(content, memoryview):
+            # Python 2.7 "re" does not accept memoryview objects
+            content = content.tobytes()
+
+        # Content is split between "]]" and ">" of every CDATA terminator
+        self.splits = [
+            m.start() + 2 for m in re.finditer(self.CDATA_END, content)]
+
+    def __iter__(self):
+        yield self.prefix
+        yield self.CDATA_START
+
+        start = 0
+        for index, end in enumerate(self.splits + [len(self.content)]):
+            if index:
+                yield self.CDATA_SPLIT
+            for offset in range(start, end, self.chunk_size):
+                yield self.content[offset:min(offset + self.chunk_size, end)]
+            start = end
+
+        yield self.CDATA_END
+        yield self.suffix
+
+    def __len__(self):
+        return (
+            len(self.prefix) + len(self.CDATA_START) + len(self.content) +
+            len(self.splits) * len(self.CDATA_SPLIT) + len(self.CDATA_END) +
+            len(self.suffix))
+
+    def to_bytes(self):
+        '''
+        Join the body into a single byte string (copying the content).
+        '''
+        return b''.join(
+            chunk.tobytes() if isinstance(chunk, memoryview) else chunk
+            for chunk in self)
+
+
 def request_stream(session, url, request_body, timeout, headers=None):
     if session._cabby_key_password:
         # Workaround until
@@ -118,47 +214,103 @@ def _cleanup_batch(curr_elem, batch):
     del batch[:]
 
 
+_TM11_BLOCK_FIELDS = dict(
+    ('{%s}%s' % (ns_map['taxii_11'], tag), tag) for tag in (
+        'Content_Binding', 'Content', 'Timestamp_Label', 'Padding',
+        'Message'))
+
+_TM11_SUBTYPE_TAG = '{%s}Subtype' % ns_map['taxii_11']
+
+
+def _child_text(children, name):
+    child = children.get(name)
+    return child.text if child is not None else None
+
+
+def _content_block_from_etree(module, elem):
+
+    if module is not tm11:
+        return module.ContentBlock.from_etree(elem)
+
+    # Same as libtaxii's ContentBlock.from_etree, except that children
+    # are collected in a single pass instead of an XPath query per field,
+    # and timestamp label is parsed without generic date parser
+    fields = {}
+    for child in elem:
+        name = _TM11_BLOCK_FIELDS.get(child.tag)
+        if name is not None and name not in fields:
+            fields[name] = child
+
+    for name in ('Content_Binding', 'Content'):
+        if name not in fields:
+            raise ValueError(
+                'Element "./taxii_11:{}" is required'.format(name))
+
+    binding = fields['Content_Binding']
+    content = fields['Content']
+
+    return tm11.ContentBlock(
+        content_binding=tm11.ContentBinding(
+            binding.attrib['binding_id'],
+            [subtype.attrib['subtype_id'] for subtype in binding
+             if subtype.tag == _TM11_SUBTYPE_TAG]),
+        # Element without children has string content
+        content=content[0] if len(content) else content.text,
+        timestamp_label=parse_datetime(
+            _child_text(fields, 'Timestamp_Label')),
+        padding=_child_text(fields, 'Padding'),
+        message=_child_text(fields, 'Message'),
+    )
+
+
 def _stream_poll_response(namespace, stream):
 
     module = const.MODULES[namespace]
 
     response_cls = const.MODULES[namespace].PollResponse
 
+    # Comparing fully qualified tags is much cheaper than
+    # evaluating XPath "local-name()" for every parsed element
+    block_tag = '{%s}%s' % (namespace, module.ContentBlock.NAME)
+    response_tag = '{%s}%s' % (namespace, response_cls.message_type)
+
     batch_max_size = 3
     to_delete_batch = []
 
     for action, elem in stream:
-        if action == 'end':
-            tag = elem.xpath('local-name()')
+        if action != 'end':
+            continue
 
-            # If current element is ContentBlock
-            if tag == module.ContentBlock.NAME:
-                obj = module.ContentBlock.from_etree(elem)
+        tag = elem.tag
 
-            # If current element is PollResponse
-            # meaning that this is a last one
-            elif tag == response_cls.message_type:
-                _cleanup_batch(elem, to_delete_batch)
-                obj = response_cls.from_etree(elem)
-            else:
-                continue
+        # If current element is ContentBlock
+        if tag == block_tag:
+            obj = _content_block_from_etree(module, elem)
 
-            if log.isEnabledFor(logging.DEBUG):
-                log.debug("Stream element:\n{}"
-                          .format(etree.tostring(elem).decode('utf-8')))
+        # If current element is PollResponse
+        # meaning that this is a last one
+        elif tag == response_tag:
+            _cleanup_batch(elem, to_delete_batch)
+            obj = response_cls.from_etree(elem)
+        else:
+            continue
 
-            yield obj
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Stream element:\n{}"
+                      .format(etree.tostring(elem).decode('utf-8')))
 
-            # Cleaning up element to free up memory
-            elem.clear()
+        yield obj
 
-            # Removing all elements from a batch if it is time
-            if len(to_delete_batch) >= batch_max_size:
-                _cleanup_batch(elem, to_delete_batch)
+        # Cleaning up element to free up memory
+        elem.clear()
 
-            # Postponing removal of the element from a tree
-            # to avoid memory corruption (libxml2 crashes)
-            to_delete_batch.append(elem)
+        # Removing all elements from a batch if it is time
+        if len(to_delete_batch) >= batch_max_size:
+            _cleanup_batch(elem, to_delete_batch)
+
+        # Postponing removal of the element from a tree
+        # to avoid memory corruption (libxml2 crashes)
+        to_delete_batch.append(elem)
 
 
 def _parse_response(stream, headers, version):
@@ -314,8 +466,14 @@ def get_generic_session(
     ca_cert=None,
     verify_ssl=True,
     jwt_token=None,
+    pool_maxsize=HTTP_POOL_MAXSIZE,
 ):
     session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
     if ca_cert:
         session.verify = ca_cert
     else:
@@ -340,7 +498,7 @@ def set_jwt_token(session, jwt_token):
     return session
 
 
-def get_taxii_session(session, url_scheme='https', content_type=None,
+def get_taxii_headers(url_scheme='https', content_type=None,
                       message_binding=const.XML_11_BINDING,
                       service_binding=None):
 
@@ -352,20 +510,31 @@ def get_taxii_session(session, url_scheme='https', content_type=None,
     if not service_binding:
         if message_binding not in const.BINDINGS_TO_SERVICES:
             raise ValueError('No service binding provided')
-        service_bindings = const.BINDINGS_TO_SERVICES[message_binding]
+        service_binding = const.BINDINGS_TO_SERVICES[message_binding]
 
     if url_scheme not in const.SCHEMA_TO_PROTOCOL_BINDINGS:
         raise ValueError(
             'No known protocol bindings for scheme {}'.format(url_scheme))
 
-    session.headers.update({
+    return {
         'Content-Type': content_type,
         'Accept': content_type,
         'X-TAXII-Content-Type': message_binding,
         'X-TAXII-Accept': message_binding,
-        'X-TAXII-Services': service_bindings,
+        'X-TAXII-Services': service_binding,
         'X-TAXII-Protocol': const.SCHEMA_TO_PROTOCOL_BINDINGS[url_scheme]
-    })
+    }
+
+
+def get_taxii_session(session, url_scheme='https', content_type=None,
+                      message_binding=const.XML_11_BINDING,
+                      service_binding=None):
+
+    session.headers.update(get_taxii_headers(
+        url_scheme=url_scheme,
+        content_type=content_type,
+        message_binding=message_binding,
+        service_binding=service_binding))
     return session
 
 
@@ -395,13 +564,13 @@ def request_with_key_password(
         raise ValueError(
             'Key password specification is not supported in Python < v2.7.9')
 
+    # Copied, as the session is shared between requests
+    request_headers = CaseInsensitiveDict(session.headers)
     if session.auth:
         # Using Requests Session's auth handlers to fill in proper headers
         DummyRequest = namedtuple('DummyRequest', ['headers'])
         request_headers = session.auth(
-            DummyRequest(headers=session.headers)).headers
-    else:
-        request_headers = session.headers
+            DummyRequest(headers=request_headers)).headers
     if headers:
         request_headers.update(headers)
 
@@ -9,8 +9,29 @@ SERVICE_TYPES = set(const.SVC_TYPES)
 
 
 class Entity(object):
-    '''Generic entity.'''
-    raw = None
+    '''Generic entity.
+
+    Entities define ``__slots__`` to keep instances small, as a poll
+    result can produce a lot of them.
+    '''
+
+    __slots__ = ('_raw',)
+
+    @property
+    def raw(self):
+        '''Raw libtaxii object the entity was converted from.'''
+        return getattr(self, '_raw', None)
+
+    @raw.setter
+    def raw(self, value):
+        self._raw = value
+
+    def _attributes(self):
+        return dict(
+            (name, getattr(self, name))
+            for cls in type(self).__mro__
+            for name in getattr(cls, '__slots__', ())
+            if hasattr(self, name))
 
 
 class ContentBlockCount(Entity):
@@ -24,13 +45,16 @@ class ContentBlockCount(Entity):
            of applicable records, or if the provided number is a lower bound
            and there may be more records than stated.
     '''
+
+    __slots__ = ('count', 'is_partial')
+
     def __init__(self, count, is_partial=False):
         self.count = count
         self.is_partial = is_partial
 
     def __repr__(self):
         t = '{cls}(count={count}, is_partial={is_partial})'
-        return t.format(cls=type(self).__name__, **vars(self))
+        return t.format(cls=type(self).__name__, **self._attributes())
 
 
 class Collection(Entity):
@@ -56,6 +80,11 @@ class Collection(Entity):
     :param int volume: collection's volume
     '''
 
+    __slots__ = (
+        'name', 'description', 'type', 'available', 'content_bindings',
+        'push_methods', 'polling_services', 'subscription_methods',
+        'receiving_inboxes', 'volume')
+
     TYPE_FEED = const.CT_DATA_FEED
     TYPE_SET = const.CT_DATA_SET
 
@@ -84,7 +113,7 @@ class Collection(Entity):
 
     def __repr__(self):
         t = '{cls}(name={name}, type={type}, available={available})'
-        return t.format(cls=type(self).__name__, **vars(self))
+        return t.format(cls=type(self).__name__, **self._attributes())
 
 
 class ContentBinding(Entity):
@@ -96,13 +125,15 @@ class ContentBinding(Entity):
     :param list subtypes: Content Subtypes IDs
     '''
 
+    __slots__ = ('id', 'subtypes')
+
     def __init__(self, id, subtypes=None):
         self.id = id
         self.subtypes = subtypes or []
 
     def __repr__(self):
         t = '{cls}(id={id}, subtypes={subtypes})'
-        return t.format(cls=type(self).__name__, **vars(self))
+        return t.format(cls=type(self).__name__, **self._attributes())
 
 
 class ServiceInstance(Entity):
@@ -114,6 +145,8 @@ class ServiceInstance(Entity):
                                   as list of strings
     '''
 
+    __slots__ = ('protocol', 'address', 'message_bindings')
+
     def __init__(self, protocol, address, message_bindings):
         self.protocol = protocol
         self.address = address
@@ -121,7 +154,7 @@ class ServiceInstance(Entity):
 
     def __repr__(self):
         t = '{cls}(protocol={protocol}, address={address})'
-        return t.format(cls=type(self).__name__, **vars(self))
+        return t.format(cls=type(self).__name__, **self._attributes())
 
 
 class InboxService(ServiceInstance):
@@ -136,6 +169,8 @@ class InboxService(ServiceInstance):
                 :py:class:`cabby.entities.ContentBinding`
     '''
 
+    __slots__ = ('content_bindings',)
+
     def __init__(self, protocol, address, message_bindings,
                  content_bindings=None):
 
@@ -153,13 +188,15 @@ class PushMethod(Entity):
     :param list message_bindings: service Message Bindings, as list of strings
     '''
 
+    __slots__ = ('protocol', 'message_bindings')
+
     def __init__(self, protocol, message_bindings):
         self.protocol = protocol
         self.message_bindings = message_bindings
 
     def __repr__(self):
         t = '{cls}(protocol={protocol})'
-        return t.format(cls=type(self).__name__, **vars(self))
+        return t.format(cls=type(self).__name__, **self._attributes())
 
 
 class SubscriptionParameters(Entity):
@@ -173,6 +210,8 @@ class SubscriptionParameters(Entity):
                :py:class:`cabby.entities.ContentBinding`
     '''
 
+    __slots__ = ('response_type', 'content_bindings')
+
     TYPE_FULL = const.RT_FULL
     TYPE_COUNT = const.RT_COUNT_ONLY
 
@@ -184,7 +223,7 @@ class SubscriptionParameters(Entity):
 
     def __repr__(self):
         t = '{cls}(response_type={response_type})'
-        return t.format(cls=type(self).__name__, **vars(self))
+        return t.format(cls=type(self).__name__, **self._attributes())
 
 
 class DetailedServiceInstance(Entity):
@@ -201,6 +240,10 @@ class DetailedServiceInstance(Entity):
     :param str message: message attached to a service
     '''
 
+    __slots__ = (
+        'type', 'version', 'protocol', 'address', 'message_bindings',
+        'available', 'message')
+
     VERSION_10 = const.TAXII_SERVICES_10
     VERSION_11 = const.TAXII_SERVICES_11
 
@@ -226,7 +269,7 @@ class DetailedServiceInstance(Entity):
 
     def __repr__(self):
         t = '{cls}(type={type}, address={address})'
-        return t.format(cls=type(self).__name__, **vars(self))
+        return t.format(cls=type(self).__name__, **self._attributes())
 
 
 class InboxDetailedService(DetailedServiceInstance):
@@ -245,6 +288,8 @@ class InboxDetailedService(DetailedServiceInstance):
     :param str message: message attached to a service
     '''
 
+    __slots__ = ('content_bindings',)
+
     def __init__(self, content_bindings, **kwargs):
         super(InboxDetailedService, self).__init__(**kwargs)
         self.content_bindings = content_bindings
@@ -260,6 +305,8 @@ class ContentBlock(Entity):
     :param datetime timestamp: content block timestamp label
     '''
 
+    __slots__ = ('content', 'binding', 'timestamp')
+
     def __init__(self, content, content_binding, timestamp):
         self.content = content
         self.binding = content_binding
@@ -267,7 +314,7 @@ class ContentBlock(Entity):
 
     def __repr__(self):
         t = '{cls}(timestamp={timestamp})'
-        return t.format(cls=type(self).__name__, **vars(self))
+        return t.format(cls=type(self).__name__, **self._attributes())
 
 
 class SubscriptionResponse(Entity):
@@ -278,6 +325,8 @@ class SubscriptionResponse(Entity):
     :param list subscriptions: a list of `cabby.entities.Subscription`
     '''
 
+    __slots__ = ('collection_name', 'message', 'subscriptions')
+
     def __init__(self, collection_name, message=None, subscriptions=None):
         self.collection_name = collection_name
         self.message = message
@@ -285,7 +334,7 @@ class SubscriptionResponse(Entity):
 
     def __repr__(self):
         t = '{cls}(collection_name={collection_name})'
-        return t.format(cls=type(self).__name__, **vars(self))
+        return t.format(cls=type(self).__name__, **self._attributes())
 
 
 class Subscription(Entity):
@@ -300,6 +349,10 @@ class Subscription(Entity):
                 a list of `cabby.entities.SubscriptionParameters`
     :param list poll_instances: a list of `cabby.entities.ServiceInstance`
     '''
+
+    __slots__ = (
+        'id', 'status', 'delivery_parameters', 'subscription_parameters',
+        'poll_instances')
     STATUS_UNKNOWN = 'UNKNOWN'
     STATUS_ACTIVE = const.SS_ACTIVE
     STATUS_PAUSED = const.SS_PAUSED
@@ -320,4 +373,4 @@ class Subscription(Entity):
 
     def __repr__(self):
         t = '{cls}(subscription_id={id}, status={status})'
-        return t.format(cls=type(self).__name__, **vars(self))
+        return t.format(cls=type(self).__name__, **self._attributes())
@@ -1,16 +1,112 @@
 
+import os
+import re
+import sys
+import threading
+import uuid
+
 import pytz
+import six
+from six.moves import queue
 from datetime import datetime
+from dateutil.tz import tzoffset, tzutc
 import libtaxii.messages_11 as tm11
+from libtaxii.common import parse_datetime_string
 
+from . import constants as const
 from .entities import ContentBinding
 
 
+# xs:dateTime with a timezone, e.g. 2015-01-22T15:28:49.947928+00:00
+DATETIME_REGEX = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?'
+    r'(?:(Z)|([+-])(\d{2}):(\d{2}))$')
+
+UTC = tzutc()
+
+
+def generate_message_ids(version, count):
+    '''
+    Generate a batch of TAXII message IDs.
+
+    IDs have the same format as the ones produced by libtaxii's
+    `generate_message_id`, but random bytes for all UUIDs in a batch
+    are read with a single `os.urandom` call.
+    '''
+    if version not in (const.TAXII_SERVICES_10, const.TAXII_SERVICES_11):
+        raise ValueError('Unknown TAXII version: {}'.format(version))
+
+    raw = os.urandom(16 * count)
+    uuids = [uuid.UUID(bytes=raw[i:i + 16], version=4)
+             for i in range(0, len(raw), 16)]
+
+    if version == const.TAXII_SERVICES_10:
+        return [str(u.int % sys.maxsize) for u in uuids]
+    return [str(u) for u in uuids]
+
+
 def get_utc_now():
-    return datetime.utcnow().replace(tzinfo=pytz.UTC)
+    return datetime.now(pytz.UTC)
 
 
-def pack_content_binding(content_binding, version):
+def parse_datetime(value):
+    '''
+    Parse TAXII timestamp string into a timezone aware datetime.
+
+    Regular expression and datetime constructor are much cheaper than
+    generic `dateutil` parser used by libtaxii, so it is used for
+    timestamps in the common ISO 8601 format. Anything else
+    is passed to libtaxii.
+    '''
+    match = DATETIME_REGEX.match(value) if value else None
+
+    if not match:
+        return parse_datetime_string(value)
+
+    (year, month, day, hour, minute, second, fraction,
+     zulu, sign, tz_hours, tz_minutes) = match.groups()
+
+    if zulu:
+        tz = UTC
+    else:
+        offset = int(tz_hours) * 3600 + int(tz_minutes) * 60
+        if not offset:
+            tz = UTC
+        else:
+            tz = tzoffset(None, -offset if sign == '-' else offset)
+
+    return datetime(
+        int(year), int(month), int(day),
+        int(hour), int(minute), int(second),
+        int(fraction[:6].ljust(6, '0')) if fraction else 0,
+        tzinfo=tz)
+
+
+# Packed bindings are cached as clients tend to reuse the same
+# small set of bindings in every request
+PACKED_BINDINGS_CACHE_SIZE = 128
+
+_packed_bindings_cache = {}
+
+
+def _content_binding_key(content_binding):
+    if isinstance(content_binding, ContentBinding):
+        return (content_binding.id, tuple(content_binding.subtypes))
+    return content_binding
+
+
+def _get_packed(key, pack):
+    packed = _packed_bindings_cache.get(key)
+
+    if packed is None:
+        if len(_packed_bindings_cache) >= PACKED_BINDINGS_CACHE_SIZE:
+            _packed_bindings_cache.clear()
+        packed = _packed_bindings_cache[key] = pack()
+
+    return packed
+
+
+def _pack_content_binding(content_binding, version):
     if isinstance(content_binding, ContentBinding):
         if version == 11:
             binding = tm11.ContentBinding(
@@ -26,17 +122,73 @@ def pack_content_binding(content_binding, version):
     return binding
 
 
+def pack_content_binding(content_binding, version):
+    key = (version, _content_binding_key(content_binding))
+    return _get_packed(
+        key, lambda: _pack_content_binding(content_binding, version))
+
+
 def pack_content_bindings(content_bindings, version):
 
     if not content_bindings:
         return None
 
-    bindings = []
+    # Cached tuple is shared between calls: libtaxii message objects
+    # either copy it into their own list (TAXII 1.1) or only read it
+    key = (version, tuple(map(_content_binding_key, content_bindings)))
+    return _get_packed(key, lambda: tuple(
+        _pack_content_binding(b, version) for b in content_bindings))
+
+
+def iterate_in_background(iterable, buffer_size):
+    '''
+    Iterate over ``iterable`` in a background thread.
+
+    Up to ``buffer_size`` items are fetched ahead of the consumer, so
+    slow producer (e.g. network stream) and consumer can work in parallel.
+    Exceptions raised by the producer are re-raised in the consumer.
+    '''
+    items = queue.Queue(maxsize=buffer_size)
+    stopped = threading.Event()
+
+    def put(entry):
+        # Give up if consumer has gone away and the queue is full
+        while not stopped.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((True, item)):
+                    break
+            else:
+                put((False, None))
+        except Exception:
+            put((False, sys.exc_info()))
+        finally:
+            if hasattr(iterable, 'close'):
+                iterable.close()
 
-    for b in content_bindings:
-        bindings.append(pack_content_binding(b, version))
+    thread = threading.Thread(target=produce)
+    thread.daemon = True
+    thread.start()
 
-    return bindings
+    try:
+        while True:
+            is_item, value = items.get()
+            if is_item:
+                yield value
+            elif value:
+                six.reraise(*value)
+            else:
+                break
+    finally:
+        stopped.set()
 
 
 def if_key_encrypted(key_file):
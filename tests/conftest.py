@@ -0,0 +1,7 @@
+import sys
+
+collect_ignore = []
+
+if sys.version_info < (3, 6):
+    # Asynchronous generators are not supported
+    collect_ignore.append('test_async_client11.py')
@@ -114,6 +114,12 @@ POLL_RESPONSE_WITH_MORE_2 = '''
 ''' % dict(collection_name=POLL_COLLECTION, block_2=CONTENT_BLOCKS[1])
 
 
+POLL_RESPONSE_EMPTY = '''
+<taxii_11:Poll_Response xmlns:taxii="http://taxii.mitre.org/messages/taxii_xml_binding-1.1" xmlns:taxii_11="http://taxii.mitre.org/messages/taxii_xml_binding-1.1" xmlns:tdq="http://taxii.mitre.org/query/taxii_default_query-1.1" message_id="375" in_response_to="65684" collection_name="%(collection_name)s" result_part_number="3">
+    <taxii_11:Inclusive_End_Timestamp>2015-01-22T15:28:49.931734+00:00</taxii_11:Inclusive_End_Timestamp>
+</taxii_11:Poll_Response>
+''' % dict(collection_name=POLL_COLLECTION)
+
 SUBSCRIPTION_RESPONSE = '''
 <taxii_11:Subscription_Management_Response xmlns:taxii="http://taxii.mitre.org/messages/taxii_xml_binding-1.1" xmlns:taxii_11="http://taxii.mitre.org/messages/taxii_xml_binding-1.1" xmlns:tdq="http://taxii.mitre.org/query/taxii_default_query-1.1" message_id="SubsResp01" in_response_to="xyz" collection_name="%(collection_name)s">
     <taxii_11:Message>Some subscription message</taxii_11:Message>
@@ -0,0 +1,196 @@
+import asyncio
+
+import pytest
+import responses
+
+from libtaxii import messages_11 as tm11
+
+from cabby import create_client
+from cabby.async_client11 import AsyncClient11
+from cabby.constants import XML_11_BINDING
+
+from fixtures11 import (
+    HOST, CONTENT, CONTENT_BINDING, CONTENT_BLOCKS, POLL_RESPONSE,
+    POLL_RESPONSE_WITH_MORE_2, INBOX_RESPONSE,
+    COLLECTION_MANAGEMENT_RESPONSE, COLLECTION_MANAGEMENT_PATH,
+    COLLECTION_MANAGEMENT_URI,
+    SUBSCRIPTION_RESPONSE, INBOX_URI, POLL_URI, POLL_PATH, POLL_COLLECTION,
+    SUBSCRIPTION_ID)
+
+
+# Utils
+
+
+def create_async_client_11(**kwargs):
+    client = create_client(HOST, version="1.1")
+    return AsyncClient11(client, **kwargs)
+
+
+def register_uri(uri, body, **kwargs):
+    responses.add(
+        method=responses.POST,
+        url=uri,
+        body=body,
+        content_type='application/xml',
+        stream=True,
+        adding_headers={'X-TAXII-Content-Type': XML_11_BINDING},
+        **kwargs)
+
+
+def get_sent_message():
+    body = responses.calls[-1].request.body
+    return tm11.get_message_from_xml(body)
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def collect(agen):
+    return [obj async for obj in agen]
+
+
+# Tests
+
+
+def test_wrong_client_version():
+
+    client = create_client(HOST, version="1.0")
+
+    with pytest.raises(ValueError):
+        AsyncClient11(client)
+
+
+@responses.activate
+def test_collections():
+
+    register_uri(COLLECTION_MANAGEMENT_URI, COLLECTION_MANAGEMENT_RESPONSE)
+
+    client = create_async_client_11()
+    collections = run(client.get_collections(uri=COLLECTION_MANAGEMENT_PATH))
+
+    assert len(collections) == 2
+
+    message = get_sent_message()
+    assert type(message) == tm11.CollectionInformationRequest
+
+
+@responses.activate
+def test_poll():
+
+    register_uri(POLL_URI, POLL_RESPONSE)
+
+    client = create_async_client_11()
+    blocks = run(collect(client.poll(POLL_COLLECTION, uri=POLL_PATH)))
+
+    assert len(blocks) == 2
+
+    message = get_sent_message()
+    assert type(message) == tm11.PollRequest
+    assert message.collection_name == POLL_COLLECTION
+
+
+@responses.activate
+def test_poll_pages():
+
+    register_uri(POLL_URI, POLL_RESPONSE)
+
+    client = create_async_client_11()
+    pages = run(collect(client.poll_pages(POLL_COLLECTION, uri=POLL_PATH)))
+
+    assert len(pages) == 1
+    assert len(pages[0]) == 2
+
+
+@responses.activate
+def test_fulfilment():
+
+    register_uri(POLL_URI, POLL_RESPONSE_WITH_MORE_2)
+
+    client = create_async_client_11()
+    blocks = run(collect(client.fulfilment(
+        POLL_COLLECTION, result_id='1', part_number=2, uri=POLL_PATH)))
+
+    assert len(blocks) == 1
+    assert blocks[0].content.decode('utf-8') == CONTENT_BLOCKS[1]
+
+    message = get_sent_message()
+    assert type(message) == tm11.PollFulfillmentRequest
+    assert message.collection_name == POLL_COLLECTION
+    assert message.result_part_number == 2
+
+
+@responses.activate
+def test_concurrent_polls():
+
+    register_uri(POLL_URI, POLL_RESPONSE)
+
+    client = create_async_client_11()
+
+    async def poll_all(count):
+        return await asyncio.gather(*[
+            collect(client.poll(POLL_COLLECTION, uri=POLL_PATH))
+            for _ in range(count)])
+
+    results = run(poll_all(5))
+
+    assert len(results) == 5
+    assert all(len(blocks) == 2 for blocks in results)
+    assert len(responses.calls) == 5
+
+
+@responses.activate
+def test_concurrent_polls_with_own_executor():
+
+    register_uri(POLL_URI, POLL_RESPONSE)
+
+    client = create_async_client_11(max_workers=50)
+    assert client.client.pool_maxsize == 50
+
+    async def poll_all(count):
+        try:
+            return await asyncio.gather(*[
+                collect(client.poll_pages(POLL_COLLECTION, uri=POLL_PATH))
+                for _ in range(count)])
+        finally:
+            await client.close()
+
+    results = run(poll_all(100))
+
+    assert all(len(pages[0]) == 2 for pages in results)
+    assert len(responses.calls) == 100
+    assert client.client._session is None
+
+
+@responses.activate
+def test_subscribtion_status():
+
+    register_uri(COLLECTION_MANAGEMENT_URI, SUBSCRIPTION_RESPONSE)
+
+    client = create_async_client_11()
+    response = run(client.get_subscription_status(
+        POLL_COLLECTION, subscription_id=SUBSCRIPTION_ID,
+        uri=COLLECTION_MANAGEMENT_PATH))
+
+    assert response.collection_name == POLL_COLLECTION
+
+    message = get_sent_message()
+    assert type(message) == tm11.ManageCollectionSubscriptionRequest
+    assert message.action == tm11.ACT_STATUS
+
+
+@responses.activate
+def test_push():
+
+    register_uri(INBOX_URI, INBOX_RESPONSE)
+
+    client = create_async_client_11()
+    run(client.push(CONTENT, CONTENT_BINDING, uri=INBOX_URI))
+
+    message = get_sent_message()
+    assert type(message) == tm11.InboxMessage
+    assert message.content_blocks[0].content == CONTENT
@@ -1,10 +1,12 @@
+import threading
 
 import pytest
 import responses
+import six
 
 from libtaxii import messages_11 as tm11
 
-from cabby import create_client
+from cabby import client11, create_client
 from cabby import exceptions as exc
 from cabby import entities
 from cabby.constants import (
@@ -14,7 +16,7 @@ from cabby.constants import (
 from fixtures11 import (
     HOST, CONTENT_BINDING, POLL_RESPONSE, POLL_RESPONSE_WITH_MORE_1,
     POLL_RESPONSE_WITH_MORE_2, INBOX_RESPONSE, SUBSCRIPTION_ID,
-    COLLECTION_MANAGEMENT_RESPONSE,
+    COLLECTION_MANAGEMENT_RESPONSE, POLL_RESPONSE_EMPTY,
     POLL_PATH, COLLECTION_MANAGEMENT_PATH, DISCOVERY_RESPONSE,
     SUBSCRIPTION_RESPONSE, DISCOVERY_PATH, CONTENT_BLOCKS,
     CONTENT, COLLECTION_MANAGEMENT_URI, DISCOVERY_URI_HTTP,
@@ -143,6 +145,27 @@ def test_collections_with_automatic_discovery():
     assert type(message) == tm11.CollectionInformationRequest
 
 
+@responses.activate
+def test_discovered_services_are_cached():
+
+    register_uri(DISCOVERY_URI_HTTP, DISCOVERY_RESPONSE)
+    register_uri(COLLECTION_MANAGEMENT_URI, COLLECTION_MANAGEMENT_RESPONSE)
+
+    client = create_client_11(discovery_path=DISCOVERY_URI_HTTP)
+
+    client.get_collections()
+    client.get_collections()
+
+    assert len(responses.calls) == 3
+    assert responses.calls[0].request.url == DISCOVERY_URI_HTTP
+
+    client.invalidate_services()
+    client.get_collections()
+
+    assert len(responses.calls) == 5
+    assert responses.calls[3].request.url == DISCOVERY_URI_HTTP
+
+
 @responses.activate
 def test_poll():
 
@@ -158,6 +181,31 @@ def test_poll():
     assert message.collection_name == POLL_COLLECTION
 
 
+@responses.activate
+def test_poll_content_block_fields():
+
+    block = tm11.ContentBlock(
+        content_binding=tm11.ContentBinding(
+            CONTENT_BINDING, subtype_ids=['subtype-1', 'subtype-2']),
+        content=CONTENT_BLOCKS[0],
+        padding='padding',
+        message='message')
+
+    response = tm11.PollResponse(
+        message_id='1', in_response_to='2', collection_name=POLL_COLLECTION,
+        content_blocks=[block])
+
+    register_uri(POLL_URI, response.to_xml())
+
+    client = create_client_11()
+    blocks = list(client.poll(POLL_COLLECTION, uri=POLL_PATH))
+
+    assert len(blocks) == 1
+    assert blocks[0].raw == block
+    assert blocks[0].binding.id == CONTENT_BINDING
+    assert blocks[0].binding.subtypes == ['subtype-1', 'subtype-2']
+
+
 @responses.activate
 def test_poll_count_only():
 
@@ -247,6 +295,104 @@ def test_poll_with_fullfilment():
     assert message.result_part_number == 2
 
 
+@pytest.mark.parametrize("method", ["poll", "poll_pages"])
+def test_poll_is_lazy(method):
+    client = create_client_11()
+
+    # Request is neither prepared nor sent until iteration starts
+    results = getattr(client, method)(POLL_COLLECTION)
+    assert not client._message_ids
+
+    with pytest.raises(exc.NoURIProvidedError):
+        next(results)
+
+
+@responses.activate
+def test_poll_with_prefetch():
+
+    register_uri(POLL_URI, POLL_RESPONSE_WITH_MORE_1)
+    register_uri(POLL_URI, POLL_RESPONSE_WITH_MORE_2)
+    register_uri(POLL_URI, POLL_RESPONSE_EMPTY)
+
+    client = create_client_11()
+
+    blocks = list(client.poll(POLL_COLLECTION, uri=POLL_PATH, prefetch=1))
+
+    assert [b.content.decode('utf-8') for b in blocks] == \
+        list(CONTENT_BLOCKS)
+
+    assert len(responses.calls) == 3
+    message = get_sent_message()
+    assert type(message) == tm11.PollFulfillmentRequest
+    assert message.result_part_number == 3
+
+
+@responses.activate
+def test_poll_with_prefetch_error():
+
+    responses.add(responses.POST, POLL_URI, status=404)
+
+    client = create_client_11()
+
+    with pytest.raises(exc.HTTPError):
+        list(client.poll(POLL_COLLECTION, uri=POLL_PATH, prefetch=10))
+
+
+@responses.activate
+def test_poll_pages():
+
+    register_uri(POLL_URI, POLL_RESPONSE)
+
+    client = create_client_11()
+    pages = list(client.poll_pages(POLL_COLLECTION, uri=POLL_PATH))
+
+    assert len(pages) == 1
+    assert len(pages[0]) == 2
+    assert all(isinstance(b, entities.ContentBlock) for b in pages[0])
+
+
+@responses.activate
+def test_poll_pages_with_fulfilment():
+
+    register_uri(POLL_URI, POLL_RESPONSE_WITH_MORE_1)
+    register_uri(POLL_URI, POLL_RESPONSE_WITH_MORE_2)
+    register_uri(POLL_URI, POLL_RESPONSE_EMPTY)
+
+    client = create_client_11()
+    pages = list(client.poll_pages(POLL_COLLECTION, uri=POLL_PATH))
+
+    assert [[b.content.decode('utf-8') for b in page] for page in pages] == \
+        [[CONTENT_BLOCKS[0]], [CONTENT_BLOCKS[1]]]
+
+
+@responses.activate
+def test_poll_pages_with_prefetch(monkeypatch):
+
+    register_uri(POLL_URI, POLL_RESPONSE_WITH_MORE_1)
+    register_uri(POLL_URI, POLL_RESPONSE_WITH_MORE_2)
+    register_uri(POLL_URI, POLL_RESPONSE_EMPTY)
+
+    converted_in = set()
+    to_entity = client11.to_content_block_entity
+
+    def record_thread(block):
+        converted_in.add(threading.current_thread())
+        return to_entity(block)
+
+    monkeypatch.setattr(client11, 'to_content_block_entity', record_thread)
+
+    client = create_client_11()
+    pages = list(client.poll_pages(POLL_COLLECTION, uri=POLL_PATH,
+                                   prefetch=1))
+
+    assert [[b.content.decode('utf-8') for b in page] for page in pages] == \
+        [[CONTENT_BLOCKS[0]], [CONTENT_BLOCKS[1]]]
+
+    # Content blocks are converted in a background thread
+    assert len(converted_in) == 1
+    assert threading.current_thread() not in converted_in
+
+
 @responses.activate
 def test_poll_with_content_bindings():
 
@@ -347,6 +493,66 @@ def test_subscribtion_status():
     assert message.action == tm11.ACT_STATUS
 
 
+@responses.activate
+def test_subscribtion_status_cache(monkeypatch):
+
+    register_uri(COLLECTION_MANAGEMENT_URI, SUBSCRIPTION_RESPONSE)
+
+    now = [1000.0]
+    monkeypatch.setattr(client11, '_monotonic', lambda: now[0])
+
+    client = create_client_11()
+
+    def get_status():
+        return client.get_subscription_status(
+            POLL_COLLECTION, uri=COLLECTION_MANAGEMENT_PATH)
+
+    # Disabled by default
+    get_status()
+    get_status()
+    assert len(responses.calls) == 2
+
+    client.enable_status_cache(ttl=60)
+
+    response = get_status()
+    assert get_status() is response
+    assert len(responses.calls) == 3
+
+    # Expired status is requested again
+    now[0] += 61
+    expired = response
+    response = get_status()
+    assert response is not expired
+    assert len(responses.calls) == 4
+    assert len(client._status_cache) == 1
+
+    # Expired entry is removed even if the request fails
+    now[0] += 61
+    responses.replace(
+        responses.POST, COLLECTION_MANAGEMENT_URI, status=500)
+    with pytest.raises(exc.HTTPError):
+        get_status()
+    assert not client._status_cache
+    assert len(responses.calls) == 5
+
+    responses.remove(responses.POST, COLLECTION_MANAGEMENT_URI)
+    register_uri(COLLECTION_MANAGEMENT_URI, SUBSCRIPTION_RESPONSE)
+
+    response = get_status()
+    assert get_status() is response
+    assert len(responses.calls) == 6
+
+    # Changing a subscription drops cached status
+    client.pause_subscription(POLL_COLLECTION, SUBSCRIPTION_ID,
+                              uri=COLLECTION_MANAGEMENT_PATH)
+    assert get_status() is not response
+    assert len(responses.calls) == 8
+
+    client.enable_status_cache(ttl=0)
+    get_status()
+    assert len(responses.calls) == 9
+
+
 @responses.activate
 def test_unsubscribe():
 
@@ -426,6 +632,21 @@ def test_push():
     assert binding == CONTENT_BINDING
 
 
+@responses.activate
+def test_push_not_indented():
+
+    register_uri(INBOX_URI, INBOX_RESPONSE)
+
+    client = create_client_11()
+
+    content = '<root><child>text</child></root>'
+    client.push(content, CONTENT_BINDING, uri=INBOX_URI)
+
+    body = responses.calls[-1].request.body
+    assert content.encode('utf-8') in body
+    assert b'\n' not in body
+
+
 @responses.activate
 def test_push_with_destination():
 
@@ -446,3 +667,68 @@ def test_push_with_destination():
     assert binding == CONTENT_BINDING
 
     assert message.destination_collection_names == dest_collections
+
+
+@responses.activate
+def test_push_bytes():
+
+    register_uri(INBOX_URI, INBOX_RESPONSE)
+
+    client = create_client_11()
+
+    # Content spans multiple chunks and contains CDATA terminators
+    content = b'text & <text> ]]> ' * 10000
+    client.push_bytes(memoryview(content), CONTENT_BINDING,
+                      collection_names=[POLL_COLLECTION], uri=INBOX_URI)
+
+    request = responses.calls[-1].request
+    chunks = list(request.body)
+    body = b''.join(bytes(chunk) for chunk in chunks)
+
+    assert len(chunks) > 2
+    assert int(request.headers['Content-Length']) == len(body)
+
+    message = tm11.get_message_from_xml(body)
+
+    assert type(message) == tm11.InboxMessage
+    assert len(message.content_blocks) == 1
+    assert message.content_blocks[0].content == content.decode('utf-8')
+    binding = message.content_blocks[0].content_binding.binding_id
+    assert binding == CONTENT_BINDING
+    assert message.destination_collection_names == [POLL_COLLECTION]
+
+
+@responses.activate
+def test_push_bytes_text():
+
+    register_uri(INBOX_URI, INBOX_RESPONSE)
+
+    client = create_client_11()
+    client.push_bytes(CONTENT, CONTENT_BINDING, uri=INBOX_URI)
+
+    body = b''.join(
+        bytes(chunk) for chunk in responses.calls[-1].request.body)
+    message = tm11.get_message_from_xml(body)
+
+    assert message.content_blocks[0].content == CONTENT
+
+
+@responses.activate
+def test_push_bytes_joined_body(monkeypatch):
+
+    register_uri(INBOX_URI, INBOX_RESPONSE)
+
+    # Python 2.7 branch: body is sent as a single byte string
+    monkeypatch.setattr(six, 'PY2', True)
+
+    client = create_client_11()
+
+    content = b'text ]]> ' * 10000
+    client.push_bytes(memoryview(content), CONTENT_BINDING, uri=INBOX_URI)
+
+    request = responses.calls[-1].request
+    assert isinstance(request.body, bytes)
+    assert int(request.headers['Content-Length']) == len(request.body)
+
+    message = tm11.get_message_from_xml(request.body)
+    assert message.content_blocks[0].content == content.decode('utf-8')
@@ -3,6 +3,7 @@ import pytest
 import json
 import gzip
 import sys
+import threading
 import requests
 from time import sleep
 
@@ -14,7 +15,7 @@ from libtaxii.constants import (
     VID_TAXII_XML_11, VID_TAXII_XML_10,
 )
 
-from cabby import create_client
+from cabby import create_client, dispatcher
 from cabby import exceptions as exc
 
 import fixtures11
@@ -95,6 +96,77 @@ def test_set_headers(version):
     assert last_request.headers[CUSTOM_HEADER_NAME] == CUSTOM_HEADER_VALUE
 
 
+@pytest.mark.parametrize("version", [11, 10])
+@responses.activate
+def test_session_reused(version):
+    uri = get_fix(version).DISCOVERY_URI_HTTP
+    response = get_fix(version).DISCOVERY_RESPONSE
+
+    register_uri(uri, response, version)
+
+    client = make_client(version)
+
+    client.discover_services(uri=uri)
+    session = client._session
+    assert session is not None
+
+    client.discover_services(uri=uri)
+    assert client._session is session
+
+    # Changed configuration requires a new session
+    client.set_auth(username='username', password='pass')
+    client.discover_services(uri=uri)
+    assert client._session is not session
+    assert 'Authorization' in responses.calls[-1].request.headers
+
+    client.close()
+    assert client._session is None
+
+
+@pytest.mark.parametrize("version", [11, 10])
+@responses.activate
+def test_session_headers_not_changed(version):
+    uri = get_fix(version).DISCOVERY_URI_HTTP
+    response = get_fix(version).DISCOVERY_RESPONSE
+
+    register_uri(uri, response, version)
+
+    client = make_client(version)
+    client.discover_services(uri=uri)
+
+    assert 'X-TAXII-Protocol' in responses.calls[-1].request.headers
+    assert 'X-TAXII-Protocol' not in client._session.headers
+
+
+@pytest.mark.parametrize("version", [11, 10])
+def test_session_shared_between_threads(version, monkeypatch):
+    created = []
+    get_generic_session = dispatcher.get_generic_session
+
+    def slow_get_generic_session(**kwargs):
+        sleep(0.01)
+        session = get_generic_session(**kwargs)
+        created.append(session)
+        return session
+
+    monkeypatch.setattr(
+        dispatcher, 'get_generic_session', slow_get_generic_session)
+
+    client = make_client(version)
+    sessions = []
+
+    threads = [
+        threading.Thread(target=lambda: sessions.append(client._get_session()))
+        for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(session is created[0] for session in sessions)
+
+
 @pytest.mark.parametrize("version", [11, 10])
 @responses.activate
 def test_invalid_response(version):
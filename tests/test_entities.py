@@ -64,3 +64,17 @@ from cabby import entities
 ])
 def test_repr(obj, expected):
     assert repr(obj) == expected
+
+
+def test_raw():
+    block = entities.ContentBlock(
+        content='', content_binding=None, timestamp=None)
+
+    assert block.raw is None
+    assert not hasattr(block, '__dict__')
+
+    block.raw = 'raw block'
+    assert block.raw == 'raw block'
+
+    with pytest.raises(AttributeError):
+        block.unknown = 'value'
@@ -0,0 +1,96 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from dateutil.parser import parse
+
+from cabby import utils
+from cabby.constants import TAXII_SERVICES_10, TAXII_SERVICES_11
+from cabby.entities import ContentBinding
+
+
+@pytest.mark.parametrize("value", [
+    '2015-01-22T15:28:49.947928+00:00',
+    '2015-01-22T15:28:49Z',
+    '2015-01-22T15:28:49.1+02:00',
+    '2015-01-22T15:28:49.123456789-05:30',
+    '2015-01-22 15:28:49+00:00',
+])
+def test_parse_datetime(value):
+    parsed = utils.parse_datetime(value)
+
+    assert parsed == parse(value)
+    assert parsed.utcoffset() == parse(value).utcoffset()
+
+
+def test_parse_datetime_offset():
+    parsed = utils.parse_datetime('2015-01-22T15:28:49-05:30')
+
+    assert parsed.utcoffset() == -timedelta(hours=5, minutes=30)
+    assert parsed.replace(tzinfo=None) == datetime(2015, 1, 22, 15, 28, 49)
+
+
+def test_parse_datetime_empty():
+    assert utils.parse_datetime(None) is None
+    assert utils.parse_datetime('') is None
+
+
+@pytest.mark.parametrize("version", [11, 10])
+def test_pack_content_bindings(version):
+    bindings = [
+        'binding-a',
+        ContentBinding('binding-b', subtypes=['subtype-1', 'subtype-2']),
+    ]
+
+    packed = utils.pack_content_bindings(bindings, version=version)
+    assert len(packed) == 2
+
+    if version == 11:
+        assert packed[0].binding_id == 'binding-a'
+        assert packed[1].binding_id == 'binding-b'
+        assert packed[1].subtype_ids == ['subtype-1', 'subtype-2']
+    else:
+        assert packed == ('binding-a', 'binding-b')
+
+    # Same bindings are packed only once
+    packed_again = utils.pack_content_bindings(list(bindings), version)
+    assert packed_again is packed
+
+
+def test_pack_content_bindings_with_changed_subtypes():
+    packed = utils.pack_content_bindings(
+        [ContentBinding('binding-b', subtypes=['subtype-1'])], version=11)
+    changed = utils.pack_content_bindings(
+        [ContentBinding('binding-b', subtypes=['subtype-2'])], version=11)
+
+    assert changed[0].subtype_ids == ['subtype-2']
+    assert changed[0] is not packed[0]
+
+
+def test_pack_content_bindings_empty():
+    assert utils.pack_content_bindings(None, version=11) is None
+    assert utils.pack_content_bindings([], version=11) is None
+
+
+def test_generate_message_ids():
+    ids = utils.generate_message_ids(TAXII_SERVICES_11, 10)
+
+    assert len(set(ids)) == 10
+    assert all(str(uuid.UUID(i)) == i for i in ids)
+    assert all(uuid.UUID(i).version == 4 for i in ids)
+
+    ids = utils.generate_message_ids(TAXII_SERVICES_10, 10)
+
+    assert len(set(ids)) == 10
+    assert all(i.isdigit() for i in ids)
+
+    with pytest.raises(ValueError):
+        utils.generate_message_ids('unknown', 10)
+
+
+def test_get_utc_now():
+    now = utils.get_utc_now()
+
+    assert now.utcoffset() == timedelta(0)
+    assert abs(now - datetime.now(pytz.UTC)) < timedelta(seconds=5)